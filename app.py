@@ -13,7 +13,8 @@ app.config.from_object(Config)
 document_store = DocumentStore()
 print("Document store initialized")
 
-# Only rebuild index if it doesn't exist (for performance)
+# Only rebuild index if it doesn't exist (for performance). A pre-built
+# snapshot (see build_index.py) is loaded by the document store without re-embedding.
 if not document_store.index_exists():
     document_store.rebuild_index_from_scratch()
     print("Index rebuilt")
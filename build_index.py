@@ -0,0 +1,224 @@
+"""
+Build, verify and compact vector store snapshots offline
+
+Examples:
+    python build_index.py build data/vector_store/documents.json resume.pdf -o snapshots/index.npz
+    python build_index.py export --vector-db-path /tmp/vector_store -o snapshots/index.npz
+    python build_index.py verify snapshots/index.npz
+    python build_index.py compact snapshots/index.npz
+    python build_index.py compact --vector-db-path /tmp/vector_store
+    python build_index.py import snapshots/index.npz --vector-db-path /tmp/vector_store --replace
+"""
+import os
+import sys
+import json
+import uuid
+import argparse
+import tempfile
+from retriever.document_store import DocumentStore
+from config import Config
+
+
+def positive_int(value: str) -> int:
+    """Parse a command-line integer that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def has_store(vector_db_path: str) -> bool:
+    """Check whether a vector DB directory holds an index and documents"""
+    return (
+        os.path.exists(os.path.join(vector_db_path, "faiss_index"))
+        and os.path.exists(os.path.join(vector_db_path, "documents.json"))
+    )
+
+
+def open_store(work_dir: str, batch_size=None) -> DocumentStore:
+    """Open an empty document store in a scratch directory"""
+    return DocumentStore(vector_db_path=work_dir, snapshot_path="", batch_size=batch_size)
+
+
+def build(args) -> int:
+    """Embed documents from JSON exports and PDF/TXT files into a new snapshot"""
+    with tempfile.TemporaryDirectory() as work_dir:
+        store = open_store(work_dir, batch_size=args.batch_size)
+
+        documents = {}
+        try:
+            for source in args.sources:
+                if source.lower().endswith('.json'):
+                    with open(source, 'r') as f:
+                        data = json.load(f)
+                    documents.update(data.get("documents", {}))
+                    print(f"Read {len(data.get('documents', {}))} documents from {source}")
+                else:
+                    content, title = store.read_file(source)
+                    documents[str(uuid.uuid4())] = {
+                        "title": title,
+                        "chunks": store.text_splitter.split_text(content),
+                        "type": "text"
+                    }
+                    print(f"Read {title}")
+        except (OSError, ValueError) as e:
+            print(f"Error reading sources: {e}")
+            return 1
+
+        store.documents = documents
+        store.rebuild_index_from_scratch()
+        store.export_snapshot(args.output)
+
+    return 0
+
+
+def export(args) -> int:
+    """Write a snapshot from an existing vector DB directory"""
+    try:
+        store = DocumentStore(vector_db_path=args.vector_db_path, snapshot_path="", create=False)
+    except Exception as e:
+        print(f"Error opening vector DB: {e}")
+        return 1
+
+    if args.compact:
+        try:
+            store.compact()
+        except ValueError as e:
+            print(f"Error compacting vector DB: {e}")
+            return 1
+
+    problems = store.verify()
+    if problems:
+        for problem in problems:
+            print(f"Problem: {problem}")
+        print("Refusing to export an inconsistent store. Orphaned or duplicate vectors can be dropped "
+              "with --compact; missing embeddings or a vector count mismatch need build.")
+        return 1
+
+    if store.index.ntotal == 0 and not args.allow_empty:
+        print("Refusing to export an empty store, pass --allow-empty to export it anyway")
+        return 1
+
+    store.export_snapshot(args.output)
+    return 0
+
+
+def verify(args) -> int:
+    """Check the snapshot checksum and the consistency of its id map"""
+    with tempfile.TemporaryDirectory() as work_dir:
+        store = open_store(work_dir)
+        try:
+            store.load_snapshot(args.snapshot)
+        except (OSError, ValueError) as e:
+            print(f"Invalid snapshot: {e}")
+            return 1
+
+        print(f"Checksum OK: {len(store.documents)} documents, {store.index.ntotal} vectors "
+              f"of dimension {store.index.d}")
+        problems = store.verify()
+
+    for problem in problems:
+        print(f"Problem: {problem}")
+    if problems:
+        print(f"Found {len(problems)} problems")
+        return 1
+
+    print("Snapshot is consistent")
+    return 0
+
+
+def compact(args) -> int:
+    """Drop orphaned vectors from a snapshot or a vector DB directory without re-embedding"""
+    if args.vector_db_path:
+        try:
+            store = DocumentStore(vector_db_path=args.vector_db_path, snapshot_path="", create=False)
+            store.compact()
+        except Exception as e:
+            print(f"Error compacting vector DB: {e}")
+            return 1
+        return 0
+
+    if not os.path.exists(args.snapshot):
+        print(f"Snapshot not found: {args.snapshot}")
+        return 1
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        store = open_store(work_dir)
+        try:
+            store.load_snapshot(args.snapshot)
+            store.compact()
+        except (OSError, ValueError) as e:
+            print(f"Error compacting snapshot: {e}")
+            return 1
+        store.export_snapshot(args.output or args.snapshot)
+
+    return 0
+
+
+def import_snapshot(args) -> int:
+    """Load a snapshot into a vector DB directory, replacing its contents"""
+    try:
+        store = DocumentStore(
+            vector_db_path=args.vector_db_path,
+            snapshot_path="",
+            create=not has_store(args.vector_db_path)
+        )
+    except Exception as e:
+        print(f"Error opening vector DB: {e}")
+        return 1
+
+    if not store.is_empty() and not args.replace:
+        print(f"Vector DB {args.vector_db_path} holds {len(store.documents)} documents, "
+              "pass --replace to overwrite them")
+        return 1
+
+    try:
+        store.load_snapshot(args.snapshot)
+    except (OSError, ValueError) as e:
+        print(f"Invalid snapshot: {e}")
+        return 1
+
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build, verify and compact vector store snapshots offline")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Embed documents into a new snapshot")
+    build_parser.add_argument("sources", nargs="+", help="documents.json exports or PDF/TXT files")
+    build_parser.add_argument("-o", "--output", default=Config.SNAPSHOT_PATH, help="Snapshot file to write")
+    build_parser.add_argument("--batch-size", type=positive_int, default=Config.EMBEDDING_BATCH_SIZE,
+                              help="Number of chunks embedded per batch")
+    build_parser.set_defaults(func=build)
+
+    export_parser = subparsers.add_parser("export", help="Snapshot an existing vector DB directory")
+    export_parser.add_argument("--vector-db-path", default=Config.VECTOR_DB_PATH, help="Vector DB directory to read")
+    export_parser.add_argument("-o", "--output", default=Config.SNAPSHOT_PATH, help="Snapshot file to write")
+    export_parser.add_argument("--compact", action="store_true",
+                               help="Drop orphaned vectors from the vector DB before exporting")
+    export_parser.add_argument("--allow-empty", action="store_true", help="Export a store with no vectors")
+    export_parser.set_defaults(func=export)
+
+    verify_parser = subparsers.add_parser("verify", help="Check a snapshot's checksum and id map")
+    verify_parser.add_argument("snapshot", nargs="?", default=Config.SNAPSHOT_PATH, help="Snapshot file to check")
+    verify_parser.set_defaults(func=verify)
+
+    compact_parser = subparsers.add_parser("compact", help="Drop orphaned vectors from a snapshot or vector DB")
+    compact_parser.add_argument("snapshot", nargs="?", default=Config.SNAPSHOT_PATH, help="Snapshot file to compact")
+    compact_parser.add_argument("-o", "--output", help="Snapshot file to write, defaults to overwriting the input")
+    compact_parser.add_argument("--vector-db-path", help="Compact this vector DB directory in place instead")
+    compact_parser.set_defaults(func=compact)
+
+    import_parser = subparsers.add_parser("import", help="Load a snapshot into a vector DB directory")
+    import_parser.add_argument("snapshot", nargs="?", default=Config.SNAPSHOT_PATH, help="Snapshot file to load")
+    import_parser.add_argument("--vector-db-path", default=Config.VECTOR_DB_PATH, help="Vector DB directory to write")
+    import_parser.add_argument("--replace", action="store_true", help="Overwrite a vector DB that holds documents")
+    import_parser.set_defaults(func=import_snapshot)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
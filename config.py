@@ -12,6 +12,11 @@ class Config:
     # Vector database settings - use /tmp for Railway
     VECTOR_DB_PATH = os.getenv("VECTOR_DB_PATH", "/tmp/vector_store")
 
+    # Pre-built snapshot (see build_index.py) used to seed an empty vector DB at boot.
+    # Kept outside data/, which Render mounts as a disk.
+    SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH", "snapshots/index.npz")
+    EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", 64))
+
     # RAG settings
     MAX_DOCUMENTS = 5
     SIMILARITY_THRESHOLD = 1.5
@@ -7,16 +7,38 @@ import uuid
 from langchain_community.document_loaders import TextLoader, PyPDFLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from retriever.embeddings import get_embedding_model
+from retriever.snapshot import write_snapshot, read_snapshot
 from config import Config
 
 class DocumentStore:
     """Vector store for document storage and retrieval"""
     
-    def __init__(self, vector_db_path: Optional[str] = None):
-        """Initialize the document store"""
+    def __init__(self, vector_db_path: Optional[str] = None, snapshot_path: Optional[str] = None,
+                 batch_size: Optional[int] = None, create: bool = True):
+        """
+        Initialize the document store
+        
+        Args:
+            vector_db_path (str): Directory holding the index and documents
+            snapshot_path (str): Snapshot used to seed an empty store, "" disables it
+            batch_size (int): Number of chunks embedded per batch
+            create (bool): Create an empty store when none exists or it fails to load;
+                when False, raise instead and never write to vector_db_path on open
+        """
         self.vector_db_path = vector_db_path or Config.VECTOR_DB_PATH
+        self.snapshot_path = Config.SNAPSHOT_PATH if snapshot_path is None else snapshot_path
+        self.batch_size = batch_size or Config.EMBEDDING_BATCH_SIZE
+        self.create = create
+        self.snapshot_checksum = None
         print(f"Using vector DB path: {self.vector_db_path}")
         
+        # Check if index exists, otherwise create it
+        self.index_path = os.path.join(self.vector_db_path, "faiss_index")
+        self.documents_path = os.path.join(self.vector_db_path, "documents.json")
+        
+        if not create and not (os.path.exists(self.index_path) and os.path.exists(self.documents_path)):
+            raise FileNotFoundError(f"No faiss_index and documents.json found in {self.vector_db_path}")
+        
         self.embeddings = get_embedding_model()
         print("Embedding model loaded")
         
@@ -28,10 +50,6 @@ class DocumentStore:
         # Create directory if it doesn't exist
         os.makedirs(self.vector_db_path, exist_ok=True)
         
-        # Check if index exists, otherwise create it
-        self.index_path = os.path.join(self.vector_db_path, "faiss_index")
-        self.documents_path = os.path.join(self.vector_db_path, "documents.json")
-        
         print(f"Index path: {self.index_path}")
         print(f"Documents path: {self.documents_path}")
         
@@ -45,6 +63,14 @@ class DocumentStore:
             self.documents = {}
             self.document_embeddings = {}
             self.initialize_index()
+        
+        # Seed an empty store from the snapshot; an existing store is never replaced at boot
+        if self.is_empty() and self.snapshot_path and os.path.exists(self.snapshot_path):
+            print(f"Store is empty, loading snapshot {self.snapshot_path}...")
+            try:
+                self.load_snapshot(self.snapshot_path)
+            except Exception as e:
+                print(f"Error loading snapshot: {e}")
             
     def initialize_index(self):
         """Initialize an empty FAISS index"""
@@ -55,6 +81,26 @@ class DocumentStore:
         # Create empty index
         self.index = faiss.IndexFlatL2(dimension)
         self.save()
+
+    def encode_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a list of texts in batches
+
+        Args:
+            texts (List[str]): Texts to embed
+
+        Returns:
+            np.ndarray: Embedding matrix of shape (len(texts), dimension)
+        """
+        if not texts:
+            return np.zeros((0, self.index.d), dtype=np.float32)
+
+        embeddings = self.embeddings.encode(
+            texts,
+            batch_size=self.batch_size,
+            show_progress_bar=False
+        )
+        return np.asarray(embeddings, dtype=np.float32)
     
     def add_text(self, content: str, title: str = "Untitled") -> str:
         """
@@ -81,19 +127,17 @@ class DocumentStore:
         }
         
         # Compute and store embeddings for each chunk
-        chunk_embeddings = []
-        for i, chunk in enumerate(chunks):
-            embedding = self.embeddings.encode(chunk)
+        chunk_embeddings = self.encode_batch(chunks)
+        for i in range(len(chunks)):
             chunk_id = f"{doc_id}_{i}"
             self.document_embeddings[chunk_id] = {
                 "doc_id": doc_id,
                 "chunk_index": i
             }
-            chunk_embeddings.append(embedding)
         
         # Add embeddings to FAISS index
-        if chunk_embeddings:
-            self.index.add(np.array(chunk_embeddings, dtype=np.float32))
+        if len(chunk_embeddings):
+            self.index.add(chunk_embeddings)
             self.save()
         
         return doc_id
@@ -108,6 +152,21 @@ class DocumentStore:
         Returns:
             str: Document ID
         """
+        content, title = self.read_file(file_path)
+        
+        # Add text to document store
+        return self.add_text(content, title)
+    
+    def read_file(self, file_path: str) -> Tuple[str, str]:
+        """
+        Extract the text of a document file
+        
+        Args:
+            file_path (str): Path to the document file
+            
+        Returns:
+            Tuple[str, str]: Text content and title
+        """
         # Determine file type and use appropriate loader
         if file_path.lower().endswith('.pdf'):
             loader = PyPDFLoader(file_path)
@@ -122,8 +181,7 @@ class DocumentStore:
         content = "\n\n".join([doc.page_content for doc in docs])
         title = os.path.basename(file_path)
         
-        # Add text to document store
-        return self.add_text(content, title)
+        return content, title
     
     def search(self, query: str, top_k: int = 5) -> List[Dict]:
         """
@@ -210,7 +268,8 @@ class DocumentStore:
         # Save documents and mappings
         data = {
             "documents": self.documents,
-            "document_embeddings": self.document_embeddings
+            "document_embeddings": self.document_embeddings,
+            "snapshot_checksum": self.snapshot_checksum
         }
         with open(self.documents_path, 'w') as f:
             json.dump(data, f)
@@ -226,6 +285,7 @@ class DocumentStore:
                 data = json.load(f)
                 self.documents = data.get("documents", {})
                 self.document_embeddings = data.get("document_embeddings", {})
+                self.snapshot_checksum = data.get("snapshot_checksum")
                 
             print(f"Loaded {len(self.documents)} documents and {len(self.document_embeddings)} embeddings")
             
@@ -254,6 +314,8 @@ class DocumentStore:
         
         except Exception as e:
             print(f"Error loading document store: {e}")
+            if not self.create:
+                raise
             # Initialize empty collections
             self.documents = {}
             self.document_embeddings = {}
@@ -269,26 +331,24 @@ class DocumentStore:
         self.index = faiss.IndexFlatL2(dimension)
         
         # Re-embed and add all chunks
-        all_embeddings = []
+        all_chunks = []
         
         for doc_id, doc_info in self.documents.items():
-            chunks = doc_info.get("chunks", [])
-            for chunk in chunks:
-                embedding = self.embeddings.encode(chunk)
-                all_embeddings.append(embedding)
+            all_chunks.extend(doc_info.get("chunks", []))
         
-        if all_embeddings:
-            self.index.add(np.array(all_embeddings, dtype=np.float32))
+        all_embeddings = self.encode_batch(all_chunks)
+        if len(all_embeddings):
+            self.index.add(all_embeddings)
             
         self.save()
 
     def load_from_json(self, json_data):
         """Load documents from provided JSON data"""
         self.documents = json_data.get("documents", {})
-        self.document_embeddings = json_data.get("document_embeddings", {})
         
-        # Rebuild the index
-        self.rebuild_index()
+        # Rebuild the index together with the id map so vectors and chunks stay aligned.
+        # This re-embeds every chunk; use load_snapshot to load pre-built vectors instead.
+        self.rebuild_index_from_scratch()
 
     def rebuild_index_from_scratch(self):
         """Completely rebuild the index from the documents"""
@@ -306,15 +366,14 @@ class DocumentStore:
         current_idx = 0
         
         # Re-embed and add all chunks
-        all_embeddings = []
+        all_chunks = []
         
         for doc_id, doc_info in self.documents.items():
             chunks = doc_info.get("chunks", [])
             print(f"Processing document {doc_id} with {len(chunks)} chunks")
             
             for i, chunk in enumerate(chunks):
-                embedding = self.embeddings.encode(chunk)
-                all_embeddings.append(embedding)
+                all_chunks.append(chunk)
                 
                 # Store mapping
                 chunk_id = f"{doc_id}_{i}"
@@ -324,12 +383,168 @@ class DocumentStore:
                 }
                 current_idx += 1
         
-        # Add all embeddings to index at once
-        if all_embeddings:
+        # Embed in batches and add all embeddings to index at once
+        all_embeddings = self.encode_batch(all_chunks)
+        if len(all_embeddings):
             print(f"Adding {len(all_embeddings)} embeddings to index")
-            self.index.add(np.array(all_embeddings, dtype=np.float32))
+            self.index.add(all_embeddings)
         else:
             print("No embeddings to add to index")
             
         self.save()
         print("Index rebuild complete")
+
+    def index_exists(self) -> bool:
+        """Check whether the index holds one vector for every chunk in the id map"""
+        return (
+            os.path.exists(self.index_path)
+            and self.index.ntotal == len(self.document_embeddings)
+        )
+
+    def get_vectors(self) -> np.ndarray:
+        """Return all vectors stored in the index, in id map order"""
+        if self.index.ntotal == 0:
+            return np.zeros((0, self.index.d), dtype=np.float32)
+        return self.index.reconstruct_n(0, self.index.ntotal)
+
+    def export_snapshot(self, snapshot_path: Optional[str] = None) -> str:
+        """
+        Write the current index, id map and chunks to a checksummed snapshot
+
+        Args:
+            snapshot_path (str): Destination file, defaults to the configured snapshot path
+
+        Returns:
+            str: Snapshot checksum
+        """
+        snapshot_path = snapshot_path or self.snapshot_path
+        checksum = write_snapshot(
+            snapshot_path,
+            self.get_vectors(),
+            self.documents,
+            self.document_embeddings,
+            Config.EMBEDDING_MODEL
+        )
+        print(f"Exported snapshot to {snapshot_path} ({checksum})")
+        return checksum
+
+    def is_empty(self) -> bool:
+        """Check whether the store holds no documents and no vectors"""
+        return not self.documents and not self.document_embeddings and self.index.ntotal == 0
+
+    def load_snapshot(self, snapshot_path: Optional[str] = None):
+        """
+        Load a snapshot without re-embedding and persist it to the vector DB path
+
+        Args:
+            snapshot_path (str): Snapshot file, defaults to the configured snapshot path
+        """
+        snapshot_path = snapshot_path or self.snapshot_path
+        vectors, documents, document_embeddings, embedding_model, checksum = read_snapshot(snapshot_path)
+
+        if embedding_model != Config.EMBEDDING_MODEL:
+            raise ValueError(
+                f"Snapshot was built with {embedding_model}, but the configured embedding model is "
+                f"{Config.EMBEDDING_MODEL}"
+            )
+
+        test_embedding = self.embeddings.encode("test")
+        dimension = len(test_embedding)
+        if vectors.shape[1] != dimension:
+            raise ValueError(
+                f"Snapshot dimension {vectors.shape[1]} does not match embedding model dimension {dimension}"
+            )
+
+        self.index = faiss.IndexFlatL2(dimension)
+        if len(vectors):
+            self.index.add(vectors)
+        self.documents = documents
+        self.document_embeddings = document_embeddings
+        self.snapshot_checksum = checksum
+        self.save()
+
+        print(f"Loaded snapshot with {len(self.documents)} documents and {self.index.ntotal} vectors")
+
+    def verify(self) -> List[str]:
+        """
+        Check the index and id map for inconsistencies
+
+        Returns:
+            List[str]: Problems found, empty if the store is consistent
+        """
+        problems = []
+
+        if self.index.ntotal != len(self.document_embeddings):
+            problems.append(
+                f"Index has {self.index.ntotal} vectors but id map has {len(self.document_embeddings)} entries"
+            )
+
+        mapped = {}
+        for chunk_id, chunk_info in self.document_embeddings.items():
+            doc_id = chunk_info.get("doc_id")
+            chunk_index = chunk_info.get("chunk_index")
+            if doc_id not in self.documents:
+                problems.append(f"Embedding {chunk_id} refers to non-existent document {doc_id}")
+            elif chunk_index is None or chunk_index >= len(self.documents[doc_id].get("chunks", [])):
+                problems.append(f"Embedding {chunk_id} refers to non-existent chunk {chunk_index} in document {doc_id}")
+            elif (doc_id, chunk_index) in mapped:
+                problems.append(
+                    f"Embedding {chunk_id} duplicates {mapped[(doc_id, chunk_index)]} for chunk {chunk_index} "
+                    f"of document {doc_id}"
+                )
+            else:
+                mapped[(doc_id, chunk_index)] = chunk_id
+
+        for doc_id, doc in self.documents.items():
+            for i in range(len(doc.get("chunks", []))):
+                if (doc_id, i) not in mapped:
+                    problems.append(f"Chunk {i} of document {doc_id} has no embedding; rebuild the index to re-embed it")
+
+        return problems
+
+    def compact(self) -> int:
+        """
+        Drop vectors whose id map entry points at a missing document or chunk
+
+        Remaining vectors are copied into a fresh index, so nothing is re-embedded.
+
+        Returns:
+            int: Number of vectors removed
+        """
+        if self.index.ntotal != len(self.document_embeddings):
+            raise ValueError(
+                f"Index has {self.index.ntotal} vectors but id map has {len(self.document_embeddings)} entries; "
+                "rebuild the index instead"
+            )
+
+        vectors = self.get_vectors()
+        keep_rows = []
+        document_embeddings = {}
+        seen = set()
+
+        for row, (chunk_id, chunk_info) in enumerate(self.document_embeddings.items()):
+            doc_id = chunk_info.get("doc_id")
+            chunk_index = chunk_info.get("chunk_index")
+            key = (doc_id, chunk_index)
+            if (
+                doc_id not in self.documents
+                or chunk_index is None
+                or chunk_index >= len(self.documents[doc_id].get("chunks", []))
+                or key in seen
+            ):
+                continue
+
+            seen.add(key)
+            keep_rows.append(row)
+            document_embeddings[chunk_id] = chunk_info
+
+        removed = len(self.document_embeddings) - len(keep_rows)
+
+        self.index = faiss.IndexFlatL2(vectors.shape[1])
+        if keep_rows:
+            self.index.add(np.ascontiguousarray(vectors[keep_rows]))
+        self.document_embeddings = document_embeddings
+        self.save()
+
+        print(f"Compacted index, removed {removed} vectors")
+        return removed
@@ -0,0 +1,128 @@
+import os
+import json
+import hashlib
+import zipfile
+import numpy as np
+from typing import Dict, Tuple
+
+SNAPSHOT_VERSION = 1
+
+
+def compute_checksum(vectors: np.ndarray, metadata: bytes) -> str:
+    """
+    Compute the checksum covering the vectors and the serialized metadata
+
+    Args:
+        vectors (np.ndarray): Embedding matrix of shape (n, dimension)
+        metadata (bytes): UTF-8 encoded JSON with documents and id map
+
+    Returns:
+        str: Hex encoded SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    digest.update(str(vectors.shape).encode("utf-8"))
+    digest.update(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+    digest.update(metadata)
+    return digest.hexdigest()
+
+
+def write_snapshot(path: str, vectors: np.ndarray, documents: Dict, document_embeddings: Dict,
+                   embedding_model: str) -> str:
+    """
+    Write vectors, id map and chunks to a single checksummed snapshot file
+
+    Args:
+        path (str): Destination file (written atomically)
+        vectors (np.ndarray): Embedding matrix, one row per entry in document_embeddings
+        documents (Dict): Documents with their chunks
+        document_embeddings (Dict): Ordered mapping of chunk IDs to document positions
+        embedding_model (str): Name of the model that produced the vectors
+
+    Returns:
+        str: Checksum of the written snapshot
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    if vectors.ndim != 2 or vectors.shape[0] != len(document_embeddings):
+        raise ValueError(
+            f"Snapshot has {vectors.shape[0] if vectors.ndim else 0} vectors "
+            f"but {len(document_embeddings)} id map entries"
+        )
+
+    metadata = json.dumps({
+        "embedding_model": embedding_model,
+        "documents": documents,
+        "document_embeddings": document_embeddings
+    }).encode("utf-8")
+    checksum = compute_checksum(vectors, metadata)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # Write to a temporary file first so a crash never leaves a half-written snapshot
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                version=np.array(SNAPSHOT_VERSION),
+                vectors=vectors,
+                metadata=np.frombuffer(metadata, dtype=np.uint8),
+                checksum=np.array(checksum)
+            )
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return checksum
+
+
+def read_snapshot(path: str) -> Tuple[np.ndarray, Dict, Dict, str, str]:
+    """
+    Read and verify a snapshot written by write_snapshot
+
+    Args:
+        path (str): Snapshot file
+
+    Returns:
+        Tuple[np.ndarray, Dict, Dict, str, str]: Vectors, documents, document embeddings,
+            the name of the embedding model that produced the vectors and the verified checksum
+
+    Raises:
+        ValueError: If the snapshot is malformed or its checksum does not match
+    """
+    try:
+        data = np.load(path, allow_pickle=False)
+        if not isinstance(data, np.lib.npyio.NpzFile):
+            raise ValueError(f"Malformed snapshot {path}: not an .npz archive")
+
+        with data:
+            version = int(data["version"])
+            vectors = data["vectors"].astype(np.float32, copy=False)
+            metadata = data["metadata"].tobytes()
+            expected = str(data["checksum"])
+    except (zipfile.BadZipFile, EOFError, KeyError) as e:
+        raise ValueError(f"Malformed snapshot {path}: {e}") from e
+
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {version} in {path}")
+    if vectors.ndim != 2:
+        raise ValueError(f"Malformed snapshot {path}: vectors must be a 2-D matrix")
+
+    actual = compute_checksum(vectors, metadata)
+    if actual != expected:
+        raise ValueError(f"Snapshot checksum mismatch for {path}: expected {expected}, got {actual}")
+
+    payload = json.loads(metadata.decode("utf-8"))
+    embedding_model = payload.get("embedding_model")
+    documents = payload.get("documents", {})
+    document_embeddings = payload.get("document_embeddings", {})
+
+    if vectors.shape[0] != len(document_embeddings):
+        raise ValueError(
+            f"Snapshot {path} has {vectors.shape[0]} vectors but {len(document_embeddings)} id map entries"
+        )
+
+    return vectors, documents, document_embeddings, embedding_model, actual
@@ -0,0 +1,30 @@
+import hashlib
+import numpy as np
+import pytest
+from config import Config
+
+DIMENSION = 8
+
+
+class FakeEncoder:
+    """Deterministic stand-in for the sentence-transformers model"""
+
+    def encode(self, texts, batch_size=None, show_progress_bar=None):
+        if isinstance(texts, str):
+            return self._encode_one(texts)
+        return np.array([self._encode_one(text) for text in texts], dtype=np.float32)
+
+    def _encode_one(self, text):
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        return np.frombuffer(digest[:DIMENSION], dtype=np.uint8).astype(np.float32)
+
+
+@pytest.fixture
+def fake_encoder(monkeypatch, tmp_path):
+    """Replace the embedding model and point the default snapshot at a missing file"""
+    import retriever.document_store
+
+    encoder = FakeEncoder()
+    monkeypatch.setattr(retriever.document_store, "get_embedding_model", lambda: encoder)
+    monkeypatch.setattr(Config, "SNAPSHOT_PATH", str(tmp_path / "missing.npz"))
+    return encoder
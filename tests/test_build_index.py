@@ -0,0 +1,71 @@
+import numpy as np
+from build_index import main
+from retriever.document_store import DocumentStore
+
+
+def make_db(path, *texts):
+    store = DocumentStore(vector_db_path=str(path), snapshot_path="")
+    for text in texts:
+        store.add_text(text)
+    return store
+
+
+def test_export_verify_and_import(fake_encoder, tmp_path):
+    make_db(tmp_path / "db", "alpha", "beta")
+    snapshot = str(tmp_path / "index.npz")
+
+    assert main(["export", "--vector-db-path", str(tmp_path / "db"), "-o", snapshot]) == 0
+    assert main(["verify", snapshot]) == 0
+    assert main(["import", snapshot, "--vector-db-path", str(tmp_path / "fresh")]) == 0
+
+    store = DocumentStore(vector_db_path=str(tmp_path / "fresh"), snapshot_path="")
+    assert len(store.documents) == 2
+
+
+def test_export_refuses_missing_and_empty_stores(fake_encoder, tmp_path):
+    snapshot = tmp_path / "index.npz"
+
+    assert main(["export", "--vector-db-path", str(tmp_path / "missing"), "-o", str(snapshot)]) == 1
+    assert not (tmp_path / "missing").exists()
+
+    make_db(tmp_path / "empty")
+    assert main(["export", "--vector-db-path", str(tmp_path / "empty"), "-o", str(snapshot)]) == 1
+    assert not snapshot.exists()
+    assert main(["export", "--vector-db-path", str(tmp_path / "empty"), "-o", str(snapshot), "--allow-empty"]) == 0
+
+
+def test_import_requires_replace_for_populated_store(fake_encoder, tmp_path):
+    make_db(tmp_path / "src", "alpha")
+    snapshot = str(tmp_path / "index.npz")
+    assert main(["export", "--vector-db-path", str(tmp_path / "src"), "-o", snapshot]) == 0
+    make_db(tmp_path / "db", "beta", "gamma")
+
+    assert main(["import", snapshot, "--vector-db-path", str(tmp_path / "db")]) == 1
+    assert main(["import", snapshot, "--vector-db-path", str(tmp_path / "db"), "--replace"]) == 0
+
+    store = DocumentStore(vector_db_path=str(tmp_path / "db"), snapshot_path="")
+    assert [doc["chunks"] for doc in store.documents.values()] == [["alpha"]]
+
+
+def test_compact_vector_db_in_place(fake_encoder, tmp_path):
+    store = make_db(tmp_path / "db", "alpha", "beta")
+    del store.documents[list(store.documents)[1]]
+    store.save()
+
+    assert main(["export", "--vector-db-path", str(tmp_path / "db"), "-o", str(tmp_path / "index.npz")]) == 1
+    assert main(["compact", "--vector-db-path", str(tmp_path / "db")]) == 0
+
+    store = DocumentStore(vector_db_path=str(tmp_path / "db"), snapshot_path="")
+    assert store.verify() == []
+    assert store.index.ntotal == 1
+
+
+def test_malformed_inputs_exit_with_error(fake_encoder, tmp_path):
+    npy = str(tmp_path / "vectors.npy")
+    np.save(npy, np.zeros((2, 8), dtype=np.float32))
+    unsupported = tmp_path / "notes.docx"
+    unsupported.write_text("x")
+
+    assert main(["verify", npy]) == 1
+    assert main(["compact", npy]) == 1
+    assert main(["build", str(unsupported), "-o", str(tmp_path / "index.npz")]) == 1
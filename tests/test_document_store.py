@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+from retriever.document_store import DocumentStore
+from retriever.snapshot import write_snapshot
+from config import Config
+
+
+def make_store(path):
+    store = DocumentStore(vector_db_path=str(path), snapshot_path="")
+    store.add_text("alpha", title="A")
+    store.add_text("beta", title="B")
+    return store
+
+
+def write_single_doc_snapshot(path, encoder, model=None):
+    documents = {"snap": {"title": "Snapshot", "chunks": ["from snapshot"], "type": "text"}}
+    document_embeddings = {"snap_0": {"doc_id": "snap", "chunk_index": 0}}
+    vectors = encoder.encode(["from snapshot"])
+    return write_snapshot(str(path), vectors, documents, document_embeddings, model or Config.EMBEDDING_MODEL)
+
+
+def test_compact_keeps_vectors_aligned_with_id_map(fake_encoder, tmp_path):
+    store = make_store(tmp_path / "db")
+    doc_a, doc_b = list(store.documents)
+
+    # Orphan the vector of B and add a duplicate mapping for A's chunk
+    del store.documents[doc_b]
+    store.index.add(fake_encoder.encode(["alpha"]))
+    store.document_embeddings["dup"] = {"doc_id": doc_a, "chunk_index": 0}
+
+    problems = store.verify()
+    assert any("non-existent document" in problem for problem in problems)
+    assert any("duplicates" in problem for problem in problems)
+
+    assert store.compact() == 2
+    assert store.verify() == []
+    assert list(store.document_embeddings) == [f"{doc_a}_0"]
+    np.testing.assert_array_equal(store.get_vectors(), fake_encoder.encode(["alpha"]))
+    assert store.search("alpha", top_k=1)[0]["content"] == "alpha"
+
+
+def test_boot_seeds_empty_store_from_snapshot(fake_encoder, tmp_path):
+    snapshot = tmp_path / "index.npz"
+    checksum = write_single_doc_snapshot(snapshot, fake_encoder)
+
+    store = DocumentStore(vector_db_path=str(tmp_path / "db"), snapshot_path=str(snapshot))
+
+    assert list(store.documents) == ["snap"]
+    assert store.snapshot_checksum == checksum
+    assert store.index_exists()
+
+
+def test_boot_keeps_existing_store(fake_encoder, tmp_path):
+    make_store(tmp_path / "db")
+    snapshot = tmp_path / "index.npz"
+    write_single_doc_snapshot(snapshot, fake_encoder)
+
+    store = DocumentStore(vector_db_path=str(tmp_path / "db"), snapshot_path=str(snapshot))
+
+    assert sorted(doc["title"] for doc in store.documents.values()) == ["A", "B"]
+    assert store.snapshot_checksum is None
+
+
+def test_boot_seeds_existing_empty_store(fake_encoder, tmp_path):
+    DocumentStore(vector_db_path=str(tmp_path / "db"), snapshot_path="")
+    snapshot = tmp_path / "index.npz"
+    write_single_doc_snapshot(snapshot, fake_encoder)
+
+    store = DocumentStore(vector_db_path=str(tmp_path / "db"), snapshot_path=str(snapshot))
+
+    assert list(store.documents) == ["snap"]
+
+
+def test_load_snapshot_rejects_other_model(fake_encoder, tmp_path):
+    snapshot = tmp_path / "index.npz"
+    write_single_doc_snapshot(snapshot, fake_encoder, model="other-model")
+    store = DocumentStore(vector_db_path=str(tmp_path / "db"), snapshot_path="")
+
+    with pytest.raises(ValueError, match="other-model"):
+        store.load_snapshot(str(snapshot))
+    assert store.is_empty()
+
+
+def test_load_snapshot_rejects_other_dimension(fake_encoder, tmp_path):
+    snapshot = tmp_path / "index.npz"
+    write_snapshot(
+        str(snapshot),
+        np.zeros((1, 4), dtype=np.float32),
+        {"snap": {"title": "Snapshot", "chunks": ["x"], "type": "text"}},
+        {"snap_0": {"doc_id": "snap", "chunk_index": 0}},
+        Config.EMBEDDING_MODEL
+    )
+    store = DocumentStore(vector_db_path=str(tmp_path / "db"), snapshot_path="")
+
+    with pytest.raises(ValueError, match="dimension"):
+        store.load_snapshot(str(snapshot))
+
+
+def test_index_exists_detects_count_mismatch(fake_encoder, tmp_path):
+    store = make_store(tmp_path / "db")
+    assert store.index_exists()
+
+    store.document_embeddings.pop(next(iter(store.document_embeddings)))
+    assert not store.index_exists()
+
+
+def test_open_without_create_does_not_touch_missing_store(fake_encoder, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        DocumentStore(vector_db_path=str(tmp_path / "db"), snapshot_path="", create=False)
+    assert not (tmp_path / "db").exists()
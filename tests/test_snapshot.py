@@ -0,0 +1,94 @@
+import os
+import zipfile
+import numpy as np
+import pytest
+from retriever.snapshot import write_snapshot, read_snapshot
+
+MODEL = "sentence-transformers/paraphrase-MiniLM-L3-v2"
+
+
+def make_store():
+    documents = {"doc": {"title": "Doc", "chunks": ["first", "second"], "type": "text"}}
+    document_embeddings = {
+        "doc_0": {"doc_id": "doc", "chunk_index": 0},
+        "doc_1": {"doc_id": "doc", "chunk_index": 1}
+    }
+    vectors = np.arange(8, dtype=np.float32).reshape(2, 4)
+    return vectors, documents, document_embeddings
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "index.npz")
+    vectors, documents, document_embeddings = make_store()
+
+    checksum = write_snapshot(path, vectors, documents, document_embeddings, MODEL)
+
+    loaded_vectors, loaded_documents, loaded_embeddings, model, loaded_checksum = read_snapshot(path)
+    np.testing.assert_array_equal(loaded_vectors, vectors)
+    assert loaded_documents == documents
+    assert list(loaded_embeddings.items()) == list(document_embeddings.items())
+    assert model == MODEL
+    assert loaded_checksum == checksum
+    assert not os.path.exists(f"{path}.tmp")
+
+
+def test_tampered_metadata_is_rejected(tmp_path):
+    path = str(tmp_path / "index.npz")
+    write_snapshot(path, *make_store(), MODEL)
+
+    with np.load(path) as data:
+        arrays = dict(data)
+    metadata = arrays["metadata"].tobytes().replace(b"first", b"FIRST")
+    arrays["metadata"] = np.frombuffer(metadata, dtype=np.uint8)
+    with open(path, "wb") as f:
+        np.savez(f, **arrays)
+
+    with pytest.raises(ValueError, match="checksum mismatch"):
+        read_snapshot(path)
+
+
+def test_truncated_file_is_rejected(tmp_path):
+    path = str(tmp_path / "index.npz")
+    write_snapshot(path, *make_store(), MODEL)
+
+    with open(path, "rb") as f:
+        content = f.read()
+    with open(path, "wb") as f:
+        f.write(content[:len(content) // 2])
+
+    with pytest.raises(ValueError):
+        read_snapshot(path)
+
+
+def test_corrupt_member_is_rejected(tmp_path):
+    path = str(tmp_path / "index.npz")
+    write_snapshot(path, *make_store(), MODEL)
+
+    with zipfile.ZipFile(path) as archive:
+        offset = archive.getinfo("vectors.npy").header_offset
+    with open(path, "r+b") as f:
+        f.seek(offset + 100)
+        byte = f.read(1)
+        f.seek(offset + 100)
+        f.write(bytes([byte[0] ^ 0xFF]))
+
+    with pytest.raises(ValueError):
+        read_snapshot(path)
+
+
+def test_npy_file_is_rejected(tmp_path):
+    path = str(tmp_path / "vectors.npy")
+    np.save(path, np.zeros((2, 4), dtype=np.float32))
+
+    with pytest.raises(ValueError, match="not an .npz archive"):
+        read_snapshot(path)
+
+
+def test_mismatched_vector_count_is_not_written(tmp_path):
+    path = str(tmp_path / "index.npz")
+    vectors, documents, document_embeddings = make_store()
+
+    with pytest.raises(ValueError):
+        write_snapshot(path, vectors[:1], documents, document_embeddings, MODEL)
+    assert not os.path.exists(path)
+    assert not os.path.exists(f"{path}.tmp")